@@ -0,0 +1,135 @@
+import asyncio
+import atexit
+import os
+
+import httpx
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+
+# Brotli responses are smaller than gzip, but both urllib3 and httpx can
+# only decode them when brotli or brotlicffi is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Headers to mimic a browser request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# (connect, read) timeouts in seconds
+TIMEOUT = (5, 15)
+
+# Maximum number of scoreboard pages fetched at once
+MAX_CONCURRENCY = 8
+
+# On-disk cache for ESPN responses and its default lifetime in seconds; the
+# file lives next to this module, not in the caller's working directory
+CACHE_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "espn_cache.sqlite")
+CACHE_EXPIRE_AFTER = 300
+
+# One session for every ESPN request so sequential calls reuse a pooled
+# keep-alive connection instead of paying a new TLS handshake each time,
+# and repeat runs within the cache lifetime are served from local SQLite
+_SESSION = CachedSession(
+    CACHE_NAME,
+    backend="sqlite",
+    expire_after=CACHE_EXPIRE_AFTER,
+    allowable_methods=("GET",),
+    stale_if_error=True,
+    cache_control=True,
+)
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+atexit.register(_SESSION.close)
+
+def get(url, **kwargs):
+    """
+    Performs a GET request through the shared session.
+
+    Args:
+        url (str): The URL to fetch
+        **kwargs: Extra arguments passed to CachedSession.get, e.g.
+            expire_after to override the cache lifetime
+
+    Returns:
+        requests.Response: The response object
+    """
+    kwargs.setdefault("timeout", TIMEOUT)
+    return _SESSION.get(url, **kwargs)
+
+def close():
+    """
+    Closes the shared session and its pooled connections.
+    """
+    _SESSION.close()
+
+def async_client():
+    """
+    Creates an HTTP/2 httpx client for concurrent ESPN requests, so they are
+    multiplexed over a single TLS connection.
+
+    Returns:
+        httpx.AsyncClient: Client to use as an async context manager
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=15.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+async def _fetch(client, url, semaphore):
+    async with semaphore:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+async def fetch_all(urls, client=None):
+    """
+    Fetches several URLs concurrently, at most MAX_CONCURRENCY at a time.
+
+    Requests go through httpx, bypassing the requests-cache store and the
+    Retry policy of the synchronous session.
+
+    Args:
+        urls (list): The URLs to fetch
+        client (httpx.AsyncClient, optional): Client to reuse; a new one is
+            created and closed when omitted
+
+    Returns:
+        list: Response bytes for each URL in order, or the raised exception
+            in place of a failed request
+    """
+    if client is None:
+        async with async_client() as client:
+            return await fetch_all(urls, client)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_fetch(client, url, semaphore) for url in urls),
+        return_exceptions=True,
+    )
+
+    # Cancellation is not a failed request, so it is propagated
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+    return results
@@ -1,8 +1,44 @@
 import requests
-from lxml import html
-import json
+import espn_http
+from lxml import etree
+from lxml.cssselect import CSSSelector
+import io
+import orjson
+import os
 import re
+import tempfile
+import time
 from datetime import datetime
+from urllib.parse import urlparse, urlunparse
+
+SCHEDULE_URL = "https://www.espn.com/tennis/schedule"
+
+# Scraped tournaments are reused from this file for CACHE_TTL seconds
+CACHE_FILE = "tennis_tournaments.json"
+CACHE_TTL = 900
+
+_SCOREBOARD_TMPL = "https://www.espn.com/tennis/scoreboard/tournament/_/eventId/{id}/competitionType/1/date/{date}"
+
+# Parser settings shared by every HTML parse, streaming or not; ids,
+# comments and processing instructions are never used
+PARSER_OPTIONS = {
+    "collect_ids": False,
+    "remove_comments": True,
+    "remove_pis": True,
+    "no_network": True,
+}
+HTML_PARSER = etree.HTMLParser(**PARSER_OPTIONS)
+
+_EVENT_ID_RE = re.compile(r'eventId/([^/]+)')
+
+# Fallback for pages where the "Current" section title can't be found
+_TOURNAMENT_LINKS = CSSSelector('div.Table__TBODY a[href*="/tennis/"]')
+
+# Text test for section titles, only run on divs that carry the title class
+_CURRENT_TITLE = etree.XPath('contains(., "Current")')
+
+# Text of the date cell in the table row holding (or being) the element
+_DATE_XPATH = etree.XPath('string(ancestor-or-self::tr[1]/td[contains(@class, "date")][1])')
 
 def get_current_tournaments():
     """
@@ -11,60 +47,135 @@ def get_current_tournaments():
     Returns:
         list: List of dictionaries with tournament name, url, and dates
     """
-    url = "https://www.espn.com/tennis/schedule"
-    
-    # Add headers to mimic a browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
+    url = SCHEDULE_URL
     
     try:
         # Get the page content
         print(f"Fetching tournaments from {url}...")
-        response = requests.get(url, headers=headers)
+        response = espn_http.get(url, expire_after=60)
         response.raise_for_status()  # Raise exception for HTTP errors
         
-        # Parse the HTML with lxml
-        tree = html.fromstring(response.content)
-        
-        # Find the section with current tournaments
-        # Look for a title element that indicates "Current Tournaments"
-        current_tournaments_section = None
-        tournament_links = []  # Initialize this variable outside the conditional blocks
-        
-        section_headers = tree.xpath('//div[contains(@class, "Table__Title")]')
+    except requests.exceptions.RequestException as e:
+        print(f"Error accessing ESPN schedule: {e}")
+        return {}
+    
+    return parse_current_tournaments(response.content)
+
+def element_text(element):
+    """
+    Returns the stripped text content of an element and its descendants.
+    """
+    return "".join(element.itertext()).strip()
+
+def _with_date(href, date):
+    """
+    Adds a date/YYYYMMDD segment to the path of a tournament URL, unless
+    the path already has one.
+    """
+    parts = urlparse(href)
+    if "/date/" in parts.path:
+        # URL already has a date, use it as is
+        return href
+    return urlunparse(parts._replace(path=f"{parts.path.rstrip('/')}/date/{date}"))
+
+def _row_date(element):
+    """
+    Returns the text of the date cell in the schedule table row of an element.
+    """
+    return _DATE_XPATH(element).strip() or "Unknown Date"
+
+def _read_current_links(response_bytes):
+    """
+    Streams an ESPN schedule page and collects (name, href, date) for every
+    tournament link in the tbody rows of the "Current" section, i.e. the
+    grandparent of the "Current" title div.
+    
+    Rows are dropped from the tree as soon as they have been read, and
+    parsing stops once that section ends (or at the first row outside it),
+    so the rest of the page is never materialized.
+    
+    Returns:
+        tuple: Whether the "Current" title was found, and the list of links
+    """
+    section = None
+    links = []
+    source = io.BytesIO(response_bytes)
+    
+    events = etree.iterparse(
+        source, events=('end',), tag=('div', 'tr'), html=True, **PARSER_OPTIONS
+    )
+    for _, elem in events:
+        if elem.tag == 'div':
+            if section is None:
+                # Section titles locate the current section, other divs are left alone
+                if "Table__Title" in (elem.get('class') or ""):
+                    if _CURRENT_TITLE(elem):
+                        section = elem.getparent().getparent()
+            elif elem is section:
+                break
+            continue
         
-        for header in section_headers:
-            if "Current" in header.text_content():
-                # Found the Current Tournaments section
-                current_tournaments_section = header.getparent().getparent()
+        if section is not None:
+            # Only rows inside the section, and under a tbody in it, count
+            in_section = False
+            in_tbody = False
+            for ancestor in elem.iterancestors():
+                if ancestor is section:
+                    in_section = True
+                    break
+                if ancestor.tag == 'tbody':
+                    in_tbody = True
+            
+            if not in_section:
                 break
+            
+            if in_tbody:
+                date_info = _row_date(elem)
+                for link in elem.xpath('.//a[contains(@href, "/tennis/")]'):
+                    links.append((element_text(link), link.get('href'), date_info))
+        
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    
+    return section is not None, links
+
+def parse_current_tournaments(response_bytes):
+    """
+    Parses the current tennis tournaments out of an ESPN schedule page.
+    
+    Args:
+        response_bytes (bytes): Raw HTML of the schedule page
+    
+    Returns:
+        list: List of dictionaries with tournament name, url, and dates
+    """
+    try:
+        # Stream the page and only keep the rows of the "Current" section
+        found_current, tournament_links = _read_current_links(response_bytes)
         
-        if not current_tournaments_section:
-            # Try alternative approach using the provided XPath pattern
+        # An empty "Current" table means no tournaments are on right now
+        if not found_current:
+            # Parse the whole page with lxml for the fallback selectors
+            tree = etree.fromstring(response_bytes, HTML_PARSER)
+            
+            # Try alternative approach using any tournament table on the page
             print("Trying alternative approach to find current tournaments...")
-            tournament_links = tree.xpath('//*[@id="fittPageContainer"]/div[2]/div[2]/div/div/div[1]/section/div/div[4]/div/div/div[2]/div/div[2]/table/tbody/tr/td[2]/div/a')
+            links = _TOURNAMENT_LINKS(tree)
             
-            if not tournament_links:
-                # One more attempt with a more general selector
-                tournament_links = tree.xpath('//div[contains(@class, "Table__TBODY")]//a[contains(@href, "/tennis/")]')
-        else:
-            # Found the section, now get all tournament links within it
-            tournament_links = current_tournaments_section.xpath('.//tbody//a[contains(@href, "/tennis/")]')
+            for link in links:
+                # The date is in a nearby cell of the same row
+                tournament_links.append((element_text(link), link.get('href'), _row_date(link)))
         
         if not tournament_links:
             print("No tournament links found.")
             return {}
         
+        # Get today's date in the format YYYYMMDD for creating scoreboard URLs
+        today = datetime.now().strftime("%Y%m%d")
+        
         tournaments = {}
-        for i, link in enumerate(tournament_links, 1):
-            tournament_name = link.text_content().strip()
-            href = link.get('href')
-            
+        for i, (tournament_name, href, date_info) in enumerate(tournament_links, 1):
             # Skip player links - they contain "/player/" in the URL
             if href and "/player/" in href:
                 continue
@@ -73,46 +184,21 @@ def get_current_tournaments():
             if href and not ("/tournament/" in href or "/eventId/" in href):
                 continue
             
-            # Try to find date information
-            # This might be in a nearby cell
-            tr_element = link.getparent()
-            while tr_element is not None and tr_element.tag != 'tr':
-                tr_element = tr_element.getparent()
-            
-            date_info = "Unknown Date"
-            if tr_element is not None:
-                date_cells = tr_element.xpath('./td[contains(@class, "date")]')
-                if date_cells:
-                    date_info = date_cells[0].text_content().strip()
-            
             # Process the tournament URL to extract useful information
             tournament_id = None
             if href:
                 # Extract tournament ID from URL if available
-                id_match = re.search(r'eventId/([^/]+)', href)
+                id_match = _EVENT_ID_RE.search(href)
                 if id_match:
                     tournament_id = id_match.group(1)
             
-            # Get today's date in the format YYYYMMDD for creating a scoreboard URL
-            today = datetime.now().strftime("%Y%m%d")
-            
             # Construct a scoreboard URL
             scoreboard_url = None
             if tournament_id:
-                scoreboard_url = f"https://www.espn.com/tennis/scoreboard/tournament/_/eventId/{tournament_id}/competitionType/1/date/{today}"
-            else:
+                scoreboard_url = _SCOREBOARD_TMPL.format(id=tournament_id, date=today)
+            elif href and "/tournament/" in href:
                 # If we couldn't extract a tournament ID but the URL contains "tournament", it's likely a valid tournament URL
-                if href and "/tournament/" in href:
-                    # Check if URL already has a date parameter
-                    if "/date/" not in href:
-                        # Add today's date to the URL
-                        if href.endswith("/"):
-                            scoreboard_url = f"{href}date/{today}"
-                        else:
-                            scoreboard_url = f"{href}/date/{today}"
-                    else:
-                        # URL already has a date, use it as is
-                        scoreboard_url = href
+                scoreboard_url = _with_date(href, today)
             
             tournaments[f"tournament_{i}"] = {
                 "name": tournament_name,
@@ -124,20 +210,70 @@ def get_current_tournaments():
         
         return tournaments
         
-    except requests.exceptions.RequestException as e:
-        print(f"Error accessing ESPN schedule: {e}")
-        return {}
     except Exception as e:
         print(f"Error processing tournament data: {e}")
         return {}
 
-def create_tournament_dict():
+def _load_cached_tournament_dict():
+    """
+    Returns today's tournament dictionary from CACHE_FILE if it was written
+    less than CACHE_TTL seconds ago, otherwise None.
+    """
+    try:
+        if time.time() - os.path.getmtime(CACHE_FILE) >= CACHE_TTL:
+            return None
+        with open(CACHE_FILE, "rb") as f:
+            cached = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    # A file left over from another day is stale regardless of its age
+    if cached.get("fetch_date") != datetime.now().strftime("%Y-%m-%d"):
+        return None
+    return cached
+
+def _save_tournament_dict(tournament_dict):
+    """
+    Atomically writes the tournament dictionary to CACHE_FILE.
+    
+    The cache is best effort: a failed write is reported and ignored so it
+    never fails the scrape itself.
+    
+    Returns:
+        bool: True if the file was written
+    """
+    tmp_file = None
+    try:
+        # A unique temp file per call keeps concurrent writers apart
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(CACHE_FILE)))
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(tournament_dict, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError as e:
+        print(f"Error saving tournament data: {e}")
+        if tmp_file is not None and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return False
+    
+    print(f"Tournament data saved to {CACHE_FILE}")
+    return True
+
+def create_tournament_dict(use_cache=True):
     """
     Creates a formatted dictionary of current tournaments.
     
+    Args:
+        use_cache (bool): Reuse a result saved within the last CACHE_TTL
+            seconds instead of scraping again
+    
     Returns:
         dict: Dictionary with tournament information
     """
+    if use_cache:
+        cached = _load_cached_tournament_dict()
+        if cached is not None:
+            return cached
+    
     tournaments = get_current_tournaments()
     
     # If no tournaments were found, return an empty dict
@@ -152,17 +288,11 @@ def create_tournament_dict():
     result["fetch_date"] = datetime.now().strftime("%Y-%m-%d")
     result["tournaments"] = tournaments
     
+    _save_tournament_dict(result)
+    
     return result
 
 # Example usage
 if __name__ == "__main__":
     tournament_dict = create_tournament_dict()
-    print(json.dumps(tournament_dict, indent=2))
-    
-    # Optionally save to file
-    with open("tennis_tournaments.json", "w") as f:
-        json.dump(tournament_dict, f, indent=2)
-    print("\nTournament data saved to tennis_tournaments.json")
-
-
-print(get_current_tournaments())
\ No newline at end of file
+    print(orjson.dumps(tournament_dict, option=orjson.OPT_INDENT_2).decode())
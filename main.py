@@ -1,7 +1,26 @@
 import requests
-from lxml import html
-import json
+import espn_http
+from get_tournaments import (
+    HTML_PARSER,
+    SCHEDULE_URL,
+    element_text,
+    get_current_tournaments,
+    parse_current_tournaments,
+)
+from lxml import etree
+import orjson
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Queries relative to the scoreboard container, compiled once
+_DIVS = etree.XPath('./div')
+_ALL_A = etree.XPath('.//a')
+
+# Tab link structures, compiled once and evaluated relative to each tab div
+_LI_A = etree.XPath('./div/ul/li/a')
+_LI_A_ALT = etree.XPath('./ul/li/a')
+
+_DATE_RE = re.compile(r'date/(\d{8})')
 
 def get_all_espn_tennis_tabs_links(url):
     """
@@ -14,37 +33,47 @@ def get_all_espn_tennis_tabs_links(url):
     Returns:
         dict: Dictionary with tournament info, links, and match pairs
     """
-    # Add headers to mimic a browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
-    
     try:
         # Get the page content
         print(f"Fetching data from {url}...")
-        response = requests.get(url, headers=headers)
+        response = espn_http.get(url, expire_after=espn_http.CACHE_EXPIRE_AFTER)
         response.raise_for_status()  # Raise exception for HTTP errors
         
+    except requests.exceptions.RequestException as e:
+        print(f"Error accessing ESPN: {e}")
+        return {"error": f"Request error: {str(e)}"}
+    
+    return parse_espn_tennis_tabs_links(response.content, url)
+
+def parse_espn_tennis_tabs_links(response_bytes, url):
+    """
+    Parses the tab links of an ESPN scoreboard page and organizes players
+    into match pairs.
+    
+    Args:
+        response_bytes (bytes): Raw HTML of the scoreboard page
+        url (str): The URL the page was fetched from, used for the date
+    
+    Returns:
+        dict: Dictionary with tournament info, links, and match pairs
+    """
+    try:
         # Parse the HTML with lxml
-        tree = html.fromstring(response.content)
+        tree = etree.fromstring(response_bytes, HTML_PARSER)
         
         # Extract tournament name using the specific XPath
         tournament_xpath = '//*[@id="fittPageContainer"]/div[2]/div[2]/div/div/div[1]/div/section/div/div[1]/div/h1'
         tournament_elements = tree.xpath(tournament_xpath)
-        tournament_name = tournament_elements[0].text_content().strip() if tournament_elements else "Unknown Tournament"
+        tournament_name = element_text(tournament_elements[0]) if tournament_elements else "Unknown Tournament"
         
         # Fallback to a more general selector if the specific XPath doesn't work
         if not tournament_elements:
             print("Tournament name not found with specific XPath, trying alternative...")
             tournament_elements = tree.xpath('//div[contains(@class, "ScoreboardHeader__Name")]')
-            tournament_name = tournament_elements[0].text_content().strip() if tournament_elements else "Unknown Tournament"
+            tournament_name = element_text(tournament_elements[0]) if tournament_elements else "Unknown Tournament"
             
         # Extract date from the URL (format YYYYMMDD)
-        date_match = re.search(r'date/(\d{8})', url)
+        date_match = _DATE_RE.search(url)
         date_str = "Unknown Date"
         if date_match:
             # Convert from YYYYMMDD to YYYY-MM-DD format
@@ -57,9 +86,10 @@ def get_all_espn_tennis_tabs_links(url):
         
         # Locate the main container first
         container_xpath = '//*[@id="fittPageContainer"]/div[2]/div[2]/div/div/div[1]/div/div/section/div/div[2]'
-        container = tree.xpath(container_xpath)
+        containers = tree.xpath(container_xpath)
+        container = containers[0] if containers else None
         
-        if not container:
+        if container is None:
             print("Main container not found. Website structure may have changed.")
             return {"error": "Main container not found"}
         
@@ -68,28 +98,31 @@ def get_all_espn_tennis_tabs_links(url):
         all_links = []
         
         # First approach: look for the pattern div/div/ul/li/a
-        tabs_divs = tree.xpath(f"{container_xpath}/div")
+        tabs_divs = _DIVS(container)
         
         print(f"Found {len(tabs_divs)} potential tab divs")
         
         for div_index, div in enumerate(tabs_divs, 1):
             # Check if this div contains the list of links we're looking for
-            link_elements = div.xpath('./div/ul/li/a')
+            link_elements = _LI_A(div)
             
-            if not link_elements:
-                # Try alternative structure
-                link_elements = div.xpath('./ul/li/a')
+            # Try alternative structure
+            used_alt = not link_elements
+            if used_alt:
+                link_elements = _LI_A_ALT(div)
+            
+            # The structure that matched tells us which XPath template applies
+            if used_alt:
+                xpath_template = f"{container_xpath}/div[{div_index}]/ul/li[{{}}]/a"
+            else:
+                xpath_template = f"{container_xpath}/div[{div_index}]/div/ul/li[{{}}]/a"
             
             for li_index, link in enumerate(link_elements, 1):
-                text = link.text_content().strip()
+                text = element_text(link)
                 href = link.get('href')
                 
                 # Generate the XPath for this element relative to the page
-                xpath = f"{container_xpath}/div[{div_index}]/div/ul/li[{li_index}]/a"
-                alt_xpath = f"{container_xpath}/div[{div_index}]/ul/li[{li_index}]/a"
-                
-                # Determine which XPath is valid by checking if element exists
-                correct_xpath = xpath if tree.xpath(xpath) else alt_xpath
+                correct_xpath = xpath_template.format(li_index)
                 
                 all_links.append({
                     "section": div_index,
@@ -103,20 +136,17 @@ def get_all_espn_tennis_tabs_links(url):
         if not all_links:
             print("Using alternative search method...")
             # Find all links within the container that match our pattern
-            all_as = tree.xpath(f"{container_xpath}//a")
+            all_as = _ALL_A(container)
             
             for i, link in enumerate(all_as):
                 # Only include links that are likely to be tab links (typically short text, not empty)
-                text = link.text_content().strip()
+                text = element_text(link)
                 if text and len(text) < 100:  # Arbitrary limit to filter out non-tab links
                     href = link.get('href')
-                    # Get the full XPath for this link
-                    xpath = tree.getpath(link)
                     all_links.append({
                         "index": i+1,
                         "text": text,
-                        "href": href,
-                        "xpath": xpath
+                        "href": href
                     })
         
         # Now create player pairs from the list of player names
@@ -131,9 +161,6 @@ def get_all_espn_tennis_tabs_links(url):
             "matches": formatted_matches
         }
         
-    except requests.exceptions.RequestException as e:
-        print(f"Error accessing ESPN: {e}")
-        return {"error": f"Request error: {str(e)}"}
     except Exception as e:
         print(f"Error processing data: {e}")
         return {"error": f"Processing error: {str(e)}"}
@@ -161,23 +188,79 @@ def create_player_pairs(player_names, tournament_name, tournament_date):
     }
     
     # Group players into pairs (matches)
-    for i in range(0, len(player_names), 2):
-        match_id = i // 2 + 1
-        
-        # Handle the case where there might be an odd number of players
-        if i + 1 < len(player_names):
-            result[f"match_{match_id}"] = {
-                "player1": player_names[i],
-                "player2": player_names[i + 1]
-            }
-        else:
-            result[f"match_{match_id}"] = {
-                "player1": player_names[i],
-                "player2": "N/A"  # No opponent
-            }
+    it = iter(player_names)
+    pairs = list(zip(it, it))
+    
+    # Handle the case where there might be an odd number of players
+    if len(player_names) % 2:
+        pairs.append((player_names[-1], "N/A"))  # No opponent
+    
+    result.update({
+        f"match_{i + 1}": {"player1": player1, "player2": player2}
+        for i, (player1, player2) in enumerate(pairs)
+    })
     
     return result
 
+async def scrape_all():
+    """
+    Fetches the schedule page, then every current tournament's scoreboard
+    concurrently over a single HTTP/2 connection.
+    
+    Unlike get_current_tournaments and get_all_espn_tennis_tabs_links, this
+    path goes through httpx, so it neither reads nor fills the requests-cache
+    store and failed requests are not retried.
+    
+    Returns:
+        dict: Dictionary mapping tournament keys to their scraped match data
+    """
+    async with espn_http.async_client() as client:
+        schedule, = await espn_http.fetch_all([SCHEDULE_URL], client)
+        if isinstance(schedule, BaseException):
+            print(f"Error accessing ESPN schedule: {schedule}")
+            return {}
+        
+        tournaments = parse_current_tournaments(schedule)
+        
+        # Only tournaments with a scoreboard URL can be scraped
+        keys = [key for key, tournament in tournaments.items() if tournament["scoreboard_url"]]
+        urls = [tournaments[key]["scoreboard_url"] for key in keys]
+        pages = await espn_http.fetch_all(urls, client)
+    
+    results = {}
+    for key, url, page in zip(keys, urls, pages):
+        if isinstance(page, BaseException):
+            print(f"Error accessing ESPN: {page}")
+            results[key] = {"error": f"Request error: {str(page)}"}
+        else:
+            results[key] = parse_espn_tennis_tabs_links(page, url)
+    
+    return results
+
+def scrape_all_threaded(max_workers=espn_http.MAX_CONCURRENCY):
+    """
+    Synchronous counterpart of scrape_all that fetches the scoreboards on a
+    thread pool sharing the pooled requests session.
+    
+    Args:
+        max_workers (int): Number of scoreboards fetched at once
+    
+    Returns:
+        dict: Dictionary mapping tournament keys to their scraped match data
+    """
+    tournaments = get_current_tournaments()
+    
+    # Only tournaments with a scoreboard URL can be scraped
+    keys = [key for key, tournament in tournaments.items() if tournament["scoreboard_url"]]
+    urls = [tournaments[key]["scoreboard_url"] for key in keys]
+    
+    # requests releases the GIL while waiting on the socket, so the
+    # fetches overlap even though parsing still happens one at a time
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = list(executor.map(get_all_espn_tennis_tabs_links, urls))
+    
+    return dict(zip(keys, pages))
+
 if __name__ == "__main__":
     # Use the URL provided
     url = "https://www.espn.com/tennis/scoreboard/tournament/_/eventId/713-2025/competitionType/1/date/20250322"
@@ -207,6 +290,6 @@ if __name__ == "__main__":
                 print(f"{key}: {value['player1']} vs {value['player2']}")
         
         # Export the matches to a JSON file
-        with open("tennis_matches.json", "w") as f:
-            json.dump(result['matches'], f, indent=2)
+        with open("tennis_matches.json", "wb") as f:
+            f.write(orjson.dumps(result['matches'], option=orjson.OPT_INDENT_2))
         print("\nMatches exported to tennis_matches.json in the requested format")
\ No newline at end of file
@@ -0,0 +1,31 @@
+import importlib
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+class ImportSideEffectsTest(unittest.TestCase):
+    """
+    Importing the scrapers must not hit ESPN; only calling them should.
+    """
+
+    def setUp(self):
+        for name in ("espn_http", "get_tournaments", "main"):
+            sys.modules.pop(name, None)
+
+    def test_import_makes_no_requests(self):
+        espn_http = importlib.import_module("espn_http")
+        fail = AssertionError("request made at import time")
+
+        with mock.patch.object(espn_http, "get", side_effect=fail) as get, \
+                mock.patch("httpx.AsyncClient", side_effect=fail) as async_client:
+            importlib.import_module("get_tournaments")
+            importlib.import_module("main")
+
+        get.assert_not_called()
+        async_client.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()